@@ -1,16 +1,21 @@
-from dataclasses import dataclass, field
-from datetime import date, datetime, timedelta
-from typing import Optional, Protocol, Union
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from time import time
+from typing import Literal, Optional, Protocol, Union, overload
 
 
 class Effective(Protocol):
+    # Implementations are mostly slotted dataclasses: don't bring a __dict__ back.
+    __slots__ = ()
+
     effectivity: "TimeRange"
 
     def __contains__(self, other: "Effective") -> bool:
-        return other.effectivity in self.effectivity
+        return self.effectivity.contains_range(other.effectivity)
 
     def is_effective_on(self, time_point: "TimePoint") -> bool:
-        return time_point in self.effectivity
+        return self.effectivity.contains_point(time_point)
 
     def overlap_with(self, other: "Effective") -> bool:
         return self.effectivity.overlap_with(other.effectivity)
@@ -19,13 +24,152 @@ class Effective(Protocol):
         return self.effectivity.adjacent_to(other.effectivity)
 
 
-@dataclass(frozen=True)
+class TimePoint:
+    # Comparisons are made on an integer key (seconds since 0001-01-01) rather
+    # than on the datetime itself, which is only built when needed.
+    __slots__ = ("_datetime", "_key")
+
+    _datetime: datetime | None
+    _key: int
+
+    def __init__(self, d: datetime | date) -> None:
+        if isinstance(d, datetime):
+            # Keys don't know about timezones: compare aware datetimes in UTC.
+            if d.tzinfo is not None:
+                d = d.astimezone(timezone.utc).replace(tzinfo=None)
+            # Persisted datetimes come back without microseconds, avoid a copy.
+            self._datetime = d.replace(microsecond=0) if d.microsecond else d
+        else:
+            self._datetime = datetime(year=d.year, month=d.month, day=d.day)
+        self._key = _datetime_to_key(self._datetime)
+
+    @classmethod
+    @lru_cache(maxsize=8192)
+    def _from_key(cls, key: int) -> "TimePoint":
+        # Boundaries (and their neighbours) come back over and over when ranges
+        # are split or merged: share the instances, and their lazy datetime.
+        time_point = object.__new__(cls)
+        time_point._datetime = None
+        time_point._key = key
+        return time_point
+
+    @classmethod
+    def _from_key_in_range(cls, key: int) -> "TimePoint":
+        # Like datetime arithmetic, fail right away rather than on first use.
+        if not _MIN._key <= key <= _MAX._key:
+            raise OverflowError("date value out of range")
+        return cls._from_key(key)
+
+    @classmethod
+    def parse(cls, d: datetime | date | None) -> Optional["TimePoint"]:
+        if d is None:
+            return None
+        else:
+            return TimePoint(d)
+
+    @classmethod
+    def max(cls) -> "TimePoint":
+        return _MAX
+
+    @classmethod
+    def min(cls) -> "TimePoint":
+        return _MIN
+
+    @classmethod
+    def now(cls) -> "TimePoint":
+        # Straight from the clock to the key, calls within the same second share
+        # the (cached) instance and no datetime is built until needed.
+        return cls._from_key(_UNIX_EPOCH_KEY + int(time()))
+
+    def next(self) -> "TimePoint":
+        return TimePoint._from_key_in_range(self._key + 1)
+
+    def prev(self) -> "TimePoint":
+        return TimePoint._from_key_in_range(self._key - 1)
+
+    def is_max(self) -> bool:
+        return self._key == _MAX._key
+
+    def is_min(self) -> bool:
+        return self._key == _MIN._key
+
+    def add_days(self, days: int) -> "TimePoint":
+        return TimePoint._from_key_in_range(self._key + days * _SECONDS_PER_DAY)
+
+    @overload
+    def to_datetime(self, min_max_as_none: Literal[False]) -> datetime: ...
+
+    @overload
+    def to_datetime(self, min_max_as_none: bool = True) -> datetime | None: ...
+
+    def to_datetime(self, min_max_as_none: bool = True) -> datetime | None:
+        # NOTE: Called for each row when persisting projections, checks are inlined.
+        if min_max_as_none and (self._key == _MIN._key or self._key == _MAX._key):
+            return None
+        return self._get_datetime()
+
+    def _get_datetime(self) -> datetime:
+        if self._datetime is None:
+            self._datetime = _key_to_datetime(self._key)
+        return self._datetime
+
+    def __repr__(self) -> str:
+        return self._get_datetime().isoformat()
+
+    def __hash__(self) -> int:
+        return hash(self._key)
+
+    def __str__(self) -> str:
+        return str(self._get_datetime())
+
+    def __lt__(self, other: "TimePoint") -> bool:
+        return self._key < other._key
+
+    def __le__(self, other: "TimePoint") -> bool:
+        return self._key <= other._key
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TimePoint):
+            return NotImplemented
+        return self._key == other._key
+
+    def __ne__(self, other: object) -> bool:
+        if not isinstance(other, TimePoint):
+            return NotImplemented
+        return self._key != other._key
+
+    def __gt__(self, other: "TimePoint") -> bool:
+        return self._key > other._key
+
+    def __ge__(self, other: "TimePoint") -> bool:
+        return self._key >= other._key
+
+
+_SECONDS_PER_DAY = 24 * 60 * 60
+
+
+def _datetime_to_key(d: datetime) -> int:
+    return d.toordinal() * _SECONDS_PER_DAY + d.hour * 3600 + d.minute * 60 + d.second
+
+
+def _key_to_datetime(key: int) -> datetime:
+    days, seconds = divmod(key, _SECONDS_PER_DAY)
+    return datetime.fromordinal(days) + timedelta(seconds=seconds)
+
+
+_UNIX_EPOCH_KEY = _datetime_to_key(datetime(1970, 1, 1))
+
+_MIN = TimePoint(datetime.min)
+_MAX = TimePoint(datetime.max)
+
+
+@dataclass(frozen=True, slots=True, eq=False)
 class TimeRange:
-    start: "TimePoint" = field(default_factory=lambda: TimePoint.min())
-    end: "TimePoint" = field(default_factory=lambda: TimePoint.max())
+    start: "TimePoint" = _MIN
+    end: "TimePoint" = _MAX
 
     def __post_init__(self) -> None:
-        if self.end < self.start:
+        if self.end._key < self.start._key:
             raise ValueError(
                 "Empty time range: 'r.start' must always be before 'r.end'"
             )
@@ -33,78 +177,93 @@ class TimeRange:
     def __repr__(self) -> str:
         return f"[{repr(self.start)}, {repr(self.end)}]"
 
+    # NOTE: Below methods compare the TimePoints' keys directly, skipping a Python
+    # level call to TimePoint's comparison methods each time.
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TimeRange):
+            return NotImplemented
+        return self.start._key == other.start._key and self.end._key == other.end._key
+
+    def __hash__(self) -> int:
+        return hash((self.start._key, self.end._key))
+
     def __lt__(self, other: "TimeRange") -> bool:
-        return self.end < other.start
+        return self.end._key < other.start._key
 
     def __gt__(self, other: "TimeRange") -> bool:
-        return self.start > other.end
+        return self.start._key > other.end._key
 
     def __contains__(self, other: Union["TimePoint", "TimeRange"]) -> bool:
         if isinstance(other, TimePoint):
-            return self.start <= other <= self.end
+            return self.contains_point(other)
         elif isinstance(other, TimeRange):
-            return other.included_in(self)
+            return self.contains_range(other)
         else:
             return False
 
+    def contains_point(self, time_point: "TimePoint") -> bool:
+        return self.start._key <= time_point._key <= self.end._key
+
+    def contains_range(self, other: "TimeRange") -> bool:
+        return other.included_in(self)
+
     def included_in(self, other: "TimeRange") -> bool:
-        return other.start <= self.start and self.end <= other.end
+        return other.start._key <= self.start._key and self.end._key <= other.end._key
 
     def overlap_with(self, other: "TimeRange") -> bool:
-        return self.start <= other.end and self.end >= other.start
+        return self.start._key <= other.end._key and self.end._key >= other.start._key
 
     def adjacent_to(self, other: "TimeRange") -> bool:
-        if self < other:
-            return self.end.next() == other.start
-        elif other < self:
-            return other.end.next() == self.start
-        else:
-            return False
+        return (
+            self.end._key + 1 == other.start._key
+            or other.end._key + 1 == self.start._key
+        )
 
     def intersection(self, other: "TimeRange") -> "TimeRange":
         assert self.overlap_with(other)
 
         return TimeRange(
-            start=max(self.start, other.start),
-            end=min(self.end, other.end),
+            start=self.start if self.start._key >= other.start._key else other.start,
+            end=self.end if self.end._key <= other.end._key else other.end,
         )
 
     def union(self, other: "TimeRange") -> "TimeRange":
         assert self.adjacent_to(other) or self.overlap_with(other)
 
         return TimeRange(
-            start=min(self.start, other.start),
-            end=max(self.end, other.end),
+            start=self.start if self.start._key <= other.start._key else other.start,
+            end=self.end if self.end._key >= other.end._key else other.end,
         )
 
     def subtract_all(self, others: list["TimeRange"]) -> list["TimeRange"]:
-        results = []
-        points_of_interest = sorted(
-            set(
-                time_point
-                for time_range in others
-                for time_point in (time_range.start, time_range.end)
-                if time_point in self
-            ),
-        )
-        in_range = self.start if not self.start in points_of_interest else None
-        for time_point in points_of_interest:
-            if in_range and not time_point.is_min():
-                prev_time_point = time_point.prev() 
-                if not any(prev_time_point in other for other in others):
-                    results.append(TimeRange(start=in_range, end=prev_time_point))
-                    in_range = None
-            elif not time_point.is_max():
-                next_time_point = time_point.next()
-                if not any(next_time_point in other for other in others):
-                    in_range = next_time_point
-        if in_range and not any(self.end in other for other in others):
-            results.append(TimeRange(start=in_range, end=self.end))
-        return results
+        """
+        Return the ordered parts of this time range not covered by any of `others`.
+        """
+
+        return [
+            TimeRange(
+                start=TimePoint._from_key(start_key), end=TimePoint._from_key(end_key)
+            )
+            for start_key, end_key in _subtract_keys(
+                self.start._key,
+                self.end._key,
+                [(other.start._key, other.end._key) for other in others],
+            )
+        ]
 
     @classmethod
     def from_datetimes(
         cls, start: datetime | None, end: datetime | None
+    ) -> "TimeRange":
+        # Persisted rows bring the same bounds back each time they are loaded, and
+        # time ranges are immutable: share them rather than building them again.
+        return cls._cached_from_datetimes(start, end)
+
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def _cached_from_datetimes(
+        cls, start: datetime | None, end: datetime | None
     ) -> "TimeRange":
         if start and end:
             return cls(start=TimePoint(start), end=TimePoint(end))
@@ -138,80 +297,28 @@ class TimeRange:
         return cls(start=TimePoint(start_time), end=TimePoint(end_time))
 
 
-class TimePoint:
-    def __init__(self, d: datetime | date) -> None:
-        if isinstance(d, datetime):
-            self._datetime: datetime = d.replace(microsecond=0)
-        else:
-            self._datetime: datetime = datetime(year=d.year, month=d.month, day=d.day)
-
-    @classmethod
-    def parse(cls, d: datetime | date | None) -> Optional["TimePoint"]:
-        if d is None:
-            return None
-        else:
-            return TimePoint(d)
-
-    @classmethod
-    def max(cls) -> "TimePoint":
-        if not hasattr(cls, "_max"):
-            cls._max = cls(datetime.max)
-        return cls._max
-
-    @classmethod
-    def min(cls) -> "TimePoint":
-        if not hasattr(cls, "_min"):
-            cls._min = cls(datetime.min)
-        return cls._min
-
-    @classmethod
-    def now(cls) -> "TimePoint":
-        return cls(datetime.utcnow())
-
-    def next(self) -> "TimePoint":
-        return TimePoint(self._datetime + timedelta(seconds=1))
-
-    def prev(self) -> "TimePoint":
-        return TimePoint(self._datetime - timedelta(seconds=1))
-
-    def is_max(self) -> bool:
-        return self == TimePoint.max()
-
-    def is_min(self) -> bool:
-        return self == TimePoint.min()
-
-    def add_days(self, days: int) -> "TimePoint":
-        return TimePoint(self._datetime + timedelta(days=days))
-
-    def to_datetime(self, min_max_as_none: bool = True) -> datetime | None:
-        if min_max_as_none and (self == TimePoint.min() or self == TimePoint.max()):
-            return None
-        else:
-            return self._datetime
-
-    def __repr__(self) -> str:
-        return self._datetime.isoformat()
-
-    def __hash__(self) -> int:
-        return hash(self._datetime)
-
-    def __str__(self) -> str:
-        return str(self._datetime)
-
-    def __lt__(self, other: "TimePoint") -> bool:
-        return self._datetime < other._datetime
-
-    def __le__(self, other: "TimePoint") -> bool:
-        return self._datetime <= other._datetime
-
-    def __eq__(self, other: "TimePoint") -> bool:
-        return self._datetime == other._datetime
-
-    def __ne__(self, other: "TimePoint") -> bool:
-        return self._datetime != other._datetime
-
-    def __gt__(self, other: "TimePoint") -> bool:
-        return self._datetime > other._datetime
-
-    def __ge__(self, other: "TimePoint") -> bool:
-        return self._datetime >= other._datetime
+def _subtract_keys(
+    start_key: int, end_key: int, others: list[tuple[int, int]]
+) -> list[tuple[int, int]]:
+    """
+    Return the ordered (start_key, end_key) ranges between start_key and end_key
+    (included) not covered by any of the `others` ranges.
+    """
+
+    # Sweep the ranges by increasing start while tracking the first key that
+    # isn't covered yet: O(n log n) instead of checking every point of interest
+    # against every other range.
+    results = []
+    uncovered_from = start_key
+    for other_start_key, other_end_key in sorted(others):
+        if other_end_key < uncovered_from:
+            continue
+        if other_start_key > end_key:
+            break
+        if uncovered_from < other_start_key:
+            results.append((uncovered_from, other_start_key - 1))
+        if other_end_key >= end_key:
+            return results
+        uncovered_from = other_end_key + 1
+    results.append((uncovered_from, end_key))
+    return results
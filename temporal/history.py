@@ -1,5 +1,8 @@
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
-from typing import Callable, Generic, Iterator, Sequence, TypeVar
+from itertools import islice
+from operator import gt
+from typing import Callable, Generic, Iterable, Iterator, TypeVar
 
 from temporal.perspective import Perspective, Snapshot
 
@@ -9,7 +12,7 @@ from .errors import MalformedHistoryError, MissingValueError
 T = TypeVar("T")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HistoryEntry(Effective, Generic[T]):
     effectivity: TimeRange
     settled_at: TimePoint
@@ -34,31 +37,61 @@ class HistoryEntry(Effective, Generic[T]):
 
 
 class History(Generic[T]):
+    __slots__ = (
+        "id",
+        "_entries",
+        "_settled_keys",
+        "_start_keys",
+        "_end_keys",
+        "_projection",
+        "_projection_start_keys",
+        "_on_record",
+    )
+
     id: str
     _entries: list[HistoryEntry[T]]
 
+    # Keys of each entry's settled_at and effectivity bounds, in the same order as
+    # _entries, to scan them without going through the entries' attributes.
+    _settled_keys: list[int]
+    _start_keys: list[int]
+    _end_keys: list[int]
+
+    # Projection of all the entries (see _project) and its start keys, built when
+    # first needed and then kept up to date as new entries are appended.
+    _projection: list[tuple[int, int, HistoryEntry[T]]] | None
+    _projection_start_keys: list[int]
+
     def __init__(
         self,
         id: str,
-        entries: Sequence[HistoryEntry[T]] = tuple(),
+        entries: Iterable[HistoryEntry[T]] = tuple(),
         on_record: Callable[[HistoryEntry[T], "History[T]"], None] | None = None,
     ) -> None:
         super().__init__()
 
         self.id = id
         self._entries = list(entries)
+        self._settled_keys = [entry.settled_at._key for entry in self._entries]
+        self._start_keys = [entry.effectivity.start._key for entry in self._entries]
+        self._end_keys = [entry.effectivity.end._key for entry in self._entries]
+        self._projection = None
+        self._projection_start_keys = []
         self._on_record = on_record
 
-        # Trust entries' order... but verify.
-        for previous_entry, next_entry in zip(self._entries, self._entries[1:]):
-            if previous_entry.settled_at > next_entry.settled_at:
-                raise MalformedHistoryError(
-                    "Entries's settled_at are expected be increasing"
-                )
-            if next_entry.version != previous_entry.version + 1:
-                raise MalformedHistoryError(
-                    "Entries's version are expected to be following each other"
-                )
+        # Trust entries' order... but verify. Comparisons are made on plain ints
+        # so that they run in C rather than one Python call per pair of entries.
+        if any(map(gt, self._settled_keys, islice(self._settled_keys, 1, None))):
+            raise MalformedHistoryError(
+                "Entries's settled_at are expected be increasing"
+            )
+        versions = [entry.version for entry in self._entries]
+        if versions and versions != list(
+            range(versions[0], versions[0] + len(versions))
+        ):
+            raise MalformedHistoryError(
+                "Entries's version are expected to be following each other"
+            )
 
     def __iter__(self) -> Iterator[HistoryEntry[T]]:
         for entry in self._entries:
@@ -80,7 +113,7 @@ class History(Generic[T]):
             settled_at=_settled_at or TimePoint.now(),
             version=self._get_next_version(),
         )
-        self._entries.append(new_entry)
+        self._append(new_entry)
 
         if self._on_record:
             self._on_record(new_entry, self)
@@ -90,7 +123,7 @@ class History(Generic[T]):
         effectivity: TimeRange,
         _settled_at: TimePoint | None = None,
     ) -> None:
-        self._entries.append(
+        self._append(
             HistoryEntry(
                 effectivity=effectivity,
                 settled_at=_settled_at or TimePoint.now(),
@@ -111,12 +144,24 @@ class History(Generic[T]):
         If settled_at isn't provided, TimePoint.now() is used.
         """
 
+        at_key = at._key
+        cutoff = self._settled_cutoff(settled_at)
+
+        # NOTE: With all the entries, which is the common case, the projection
+        # tells which entry is the latest piece of knowledge at that point in time.
+        if cutoff == len(self._entries):
+            projection = self._project_all()
+            index = bisect_right(self._projection_start_keys, at_key) - 1
+            if index >= 0 and at_key <= projection[index][1]:
+                return projection[index][2].get_value()
+            raise MissingValueError(f"No known value found at time")
+
         # NOTE: We look at the latest piece of knowledge we have on the property for that point in time.
         # Since the entries are ordered, we can stop looking at the first matching entry.
-
-        for entry in self._entries_settled_at(settled_at):
-            if at in entry.effectivity:
-                return entry.get_value()
+        start_keys, end_keys = self._start_keys, self._end_keys
+        for index in range(cutoff - 1, -1, -1):
+            if start_keys[index] <= at_key <= end_keys[index]:
+                return self._entries[index].get_value()
 
         raise MissingValueError(f"No known value found at time")
 
@@ -124,41 +169,140 @@ class History(Generic[T]):
         self,
         settled_at: TimePoint,
     ) -> Perspective[T]:
-        projections: list[tuple[TimeRange, T, bool]] = []
-
-        for entry in self._entries_settled_at(settled_at):
-            known_time_ranges = [projection[0] for projection in projections]
-            for time_range in entry.effectivity.subtract_all(known_time_ranges):
-                projections.append((time_range, entry._value, entry.is_empty()))
+        cutoff = self._settled_cutoff(settled_at)
+        if cutoff == len(self._entries):
+            projection = self._project_all()
+        else:
+            projection = self._project(cutoff)
 
         return Perspective(
             settled_at=settled_at,
-            entries=sorted(
-                [
-                    Snapshot(effectivity=projection[0], value=projection[1])
-                    for projection in projections
-                    if not projection[2]
-                ],
-                key=lambda pe: pe.effectivity.start,
-            ),
+            entries=[
+                Snapshot(
+                    effectivity=TimeRange(
+                        start=TimePoint._from_key(start_key),
+                        end=TimePoint._from_key(end_key),
+                    ),
+                    value=entry._value,
+                )
+                for start_key, end_key, entry in projection
+                if not entry.is_empty()
+            ],
         )
 
-    def _entries_settled_at(
-        self,
-        settled_at: TimePoint | None = None,
-    ) -> Iterator[HistoryEntry[T]]:
+    def _settled_cutoff(self, settled_at: TimePoint | None = None) -> int:
         """
-        Yields each HistoryEntry from the most to the least recently settled.
-        Entries settled after the provided `settled_at` time are excluded.
+        Number of entries settled at the provided `settled_at` time.
 
         By default, without settled_at, TimePoint.now() is used.
         """
         settled_at = settled_at or TimePoint.now()
 
-        for entry in reversed(self._entries):
-            if entry.settled_at > settled_at:
+        # Entries are sorted by settled_at, skip the ones settled after in O(log n).
+        return bisect_right(self._settled_keys, settled_at._key)
+
+    def _project_all(self) -> list[tuple[int, int, HistoryEntry[T]]]:
+        if self._projection is None:
+            self._projection = self._project(len(self._entries))
+            self._projection_start_keys = [segment[0] for segment in self._projection]
+        return self._projection
+
+    def _project(self, cutoff: int) -> list[tuple[int, int, HistoryEntry[T]]]:
+        """
+        Split the timeline into (start_key, end_key, entry) segments, ordered by
+        start, where entry is the most recently settled of the first `cutoff`
+        entries effective during the segment.
+        """
+        start_keys = self._start_keys[:cutoff]
+        end_keys = self._end_keys[:cutoff]
+
+        # The boundaries of all the effectivities partition the timeline into
+        # elementary segments: segment i goes from bounds[i] to bounds[i + 1] - 1.
+        bounds = sorted({*start_keys, *[end_key + 1 for end_key in end_keys]})
+        owners = [-1] * (len(bounds) - 1)
+
+        # Each entry, from the most recently settled, claims the segments of its
+        # effectivity that aren't claimed yet. Claimed segments are skipped by
+        # following next_free, which points towards the next unclaimed segment
+        # (the last index being a sentinel).
+        next_free = list(range(len(bounds)))
+
+        def find_free(index: int) -> int:
+            free = index
+            while next_free[free] != free:
+                free = next_free[free]
+            while next_free[index] != free:
+                next_free[index], index = free, next_free[index]
+            return free
+
+        for entry_index in range(cutoff - 1, -1, -1):
+            index = find_free(bisect_left(bounds, start_keys[entry_index]))
+            stop = bisect_left(bounds, end_keys[entry_index] + 1)
+            while index < stop:
+                owners[index] = entry_index
+                next_free[index] = index + 1
+                index = find_free(index + 1)
+
+        # Merge the consecutive segments claimed by the same entry
+        segments: list[tuple[int, int, HistoryEntry[T]]] = []
+        previous_owner, previous_end_key = -1, None
+        for index, owner in enumerate(owners):
+            if owner == -1:
                 continue
-            yield entry
+            if owner == previous_owner and previous_end_key == bounds[index] - 1:
+                segments[-1] = (segments[-1][0], bounds[index + 1] - 1, segments[-1][2])
+            else:
+                segments.append(
+                    (bounds[index], bounds[index + 1] - 1, self._entries[owner])
+                )
+            previous_owner, previous_end_key = owner, bounds[index + 1] - 1
+
+        return segments
+
+    def _append(self, entry: HistoryEntry[T]) -> None:
+        # Lookups bisect _settled_keys: keep it sorted, like __init__ verifies.
+        if self._settled_keys and entry.settled_at._key < self._settled_keys[-1]:
+            raise MalformedHistoryError(
+                "Entries's settled_at are expected be increasing"
+            )
+
+        self._entries.append(entry)
+        self._settled_keys.append(entry.settled_at._key)
+        self._start_keys.append(entry.effectivity.start._key)
+        self._end_keys.append(entry.effectivity.end._key)
+        if self._projection is not None:
+            self._fold_into_projection(entry)
+
+    def _fold_into_projection(self, entry: HistoryEntry[T]) -> None:
+        """
+        Update the projection of all the entries with the last appended one.
+
+        Being the latest, that entry overrides its whole effectivity: only the
+        overlapping segments need to change instead of projecting again.
+        """
+        assert self._projection is not None
+        projection, start_keys = self._projection, self._projection_start_keys
+        start_key = entry.effectivity.start._key
+        end_key = entry.effectivity.end._key
+
+        # Segments from first (included) to last (excluded) overlap the new entry
+        first = bisect_right(start_keys, start_key) - 1
+        if first < 0 or projection[first][1] < start_key:
+            first += 1
+        last = bisect_right(start_keys, end_key, first)
+
+        # Overlapped segments are replaced, keeping what sticks out on both sides
+        segments = [(start_key, end_key, entry)]
+        if first < last and projection[first][0] < start_key:
+            segments.insert(
+                0, (projection[first][0], start_key - 1, projection[first][2])
+            )
+        if first < last and projection[last - 1][1] > end_key:
+            segments.append(
+                (end_key + 1, projection[last - 1][1], projection[last - 1][2])
+            )
+        projection[first:last] = segments
+        start_keys[first:last] = [segment[0] for segment in segments]
 
     def _get_next_version(self) -> int:
         return self._entries[-1].version + 1 if self._entries else 0
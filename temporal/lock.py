@@ -1,6 +1,6 @@
 import threading
-from collections import defaultdict
 from typing import Protocol
+from weakref import WeakValueDictionary
 
 
 class Lock(Protocol):
@@ -24,14 +24,31 @@ class Lock(Protocol):
         ...
 
 
-_default_lock_instances: dict[str, threading.Lock] = defaultdict(threading.Lock)
+# Locks are shared by key as long as some DefaultLock holds on to them.
+_default_lock_instances: WeakValueDictionary[str, threading.Lock] = (
+    WeakValueDictionary()
+)
+_default_lock_instances_lock = threading.Lock()
 
 
 class DefaultLock(Lock):
+    # The shared lock, only held between acquire and release
+    _lock: threading.Lock | None = None
+
     def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
-        return _default_lock_instances[self.key].acquire(blocking, timeout)
+        with _default_lock_instances_lock:
+            lock = _default_lock_instances.get(self.key)
+            if lock is None:
+                lock = _default_lock_instances[self.key] = threading.Lock()
+        # Only keep the lock once acquired: while this instance is shared and held
+        # by another thread, its release must not lose track of our lock.
+        if not lock.acquire(blocking, timeout):
+            return False
+        self._lock = lock
+        return True
 
-    def release(self):
-        lock = _default_lock_instances[self.key]
-        del _default_lock_instances[self.key]
+    def release(self) -> None:
+        if self._lock is None:
+            raise RuntimeError("release unlocked lock")
+        lock, self._lock = self._lock, None
         lock.release()
@@ -1,4 +1,6 @@
+from bisect import bisect_right
 from dataclasses import dataclass
+from itertools import islice
 from typing import Generic, Iterator, Sequence, TypeVar
 
 from temporal.effective import Effective, TimePoint, TimeRange
@@ -7,16 +9,21 @@ from temporal.errors import MalformedPerspectiveError, MissingValueError
 T = TypeVar("T")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Snapshot(Effective, Generic[T]):
     effectivity: TimeRange
     value: T
 
 
 class Perspective(Generic[T]):
+    __slots__ = ("settled_at", "_entries", "_start_keys")
+
     settled_at: TimePoint
     _entries: list[Snapshot[T]]
 
+    # Keys of each entry's effectivity start, in the same order as _entries
+    _start_keys: list[int]
+
     def __init__(
         self, settled_at: TimePoint, entries: Sequence[Snapshot[T]] = tuple()
     ) -> None:
@@ -38,34 +45,57 @@ class Perspective(Generic[T]):
 
         # Compact entries
         self._compact_entries()
+        self._start_keys = [entry.effectivity.start._key for entry in self._entries]
 
     def __iter__(self) -> Iterator[Snapshot[T]]:
         for entry in self._entries:
             yield entry
 
     def fetch(self, at: TimePoint) -> T:
-        for entry in reversed(self._entries):
-            if at in entry.effectivity:
-                return entry.value
+        return self.get_snapshot(at).value
+
+    def get_snapshot(self, at: TimePoint) -> Snapshot[T]:
+        """
+        Return the snapshot effective at `at` point.
+        """
+
+        # Entries are sorted and non-overlapping: only the last one starting at or
+        # before `at` can contain it.
+        index = bisect_right(self._start_keys, at._key) - 1
+        if index >= 0 and at._key <= self._entries[index].effectivity.end._key:
+            return self._entries[index]
 
         raise MissingValueError(f"No known value found at time")
 
     def _compact_entries(self) -> None:
-        compacted_entries = []
-        for entry in self._entries:
+        # Entries are sorted and non-overlapping: a single pass finds each run of
+        # adjacent entries sharing the same value. A Snapshot is only built for
+        # runs of more than one entry.
+        if not self._entries:
+            return
+
+        compacted_entries: list[Snapshot[T]] = []
+        append = compacted_entries.append
+        run_first = run_last = self._entries[0]
+        for entry in islice(self._entries, 1, None):
             if (
-                compacted_entries
-                and compacted_entries[-1].adjacent_to(entry)
-                and compacted_entries[-1].value == entry.value
+                entry.effectivity.start._key == run_last.effectivity.end._key + 1
+                and entry.value == run_last.value
             ):
-                last_value = compacted_entries.pop()
-                compacted_entries.append(
-                    Snapshot(
-                        effectivity=last_value.effectivity.union(entry.effectivity),
-                        value=entry.value,
-                    )
-                )
-            else:
-                compacted_entries.append(entry)
+                run_last = entry
+                continue
+            append(_merge_run(run_first, run_last))
+            run_first = run_last = entry
+        append(_merge_run(run_first, run_last))
 
         self._entries = compacted_entries
+
+
+def _merge_run(first: Snapshot[T], last: Snapshot[T]) -> Snapshot[T]:
+    if first is last:
+        return first
+
+    return Snapshot(
+        effectivity=TimeRange(start=first.effectivity.start, end=last.effectivity.end),
+        value=last.value,
+    )
@@ -7,10 +7,12 @@ class HistoryEntryMixin:
     start_at: Mapped[datetime | None] = mapped_column(
         DateTime,
         nullable=True,
+        index=True,
     )
     end_at: Mapped[datetime | None] = mapped_column(
         DateTime,
         nullable=True,
+        index=True,
     )
     is_forgotten: Mapped[bool] = mapped_column(
         Boolean,
@@ -21,6 +23,7 @@ class HistoryEntryMixin:
     settled_at: Mapped[datetime] = mapped_column(
         DateTime,
         nullable=False,
+        index=True,
     )
     version: Mapped[int] = mapped_column(
         Integer,
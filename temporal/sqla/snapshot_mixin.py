@@ -7,8 +7,10 @@ class SnapshotMixin:
     start_at: Mapped[datetime] = mapped_column(
         DateTime,
         nullable=False,
+        index=True,
     )
     end_at: Mapped[datetime] = mapped_column(
         DateTime,
         nullable=False,
+        index=True,
     )
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Iterator
 
 import pytest
@@ -5,6 +6,8 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm.session import Session as SqlaSession
 from sqlalchemy.orm.session import sessionmaker
 
+from temporal.effective import TimePoint
+
 from .models import Base  # This will also load all models
 
 # Setup a test database, in memory
@@ -20,3 +23,10 @@ def session() -> Iterator[SqlaSession]:
 
     with Session() as session:
         yield session
+
+
+def at(day: int) -> TimePoint:
+    """
+    Shorthand for a TimePoint at the start of the given day of January 2023.
+    """
+    return TimePoint(datetime(2023, 1, day))
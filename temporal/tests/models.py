@@ -1,7 +1,17 @@
-from sqlalchemy import ForeignKey, Integer, String
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from typing import Callable, Iterable
+from weakref import WeakKeyDictionary, ref
+
+from sqlalchemy import ForeignKey, Index, Integer, String, insert
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    mapped_column,
+    object_session,
+    relationship,
+)
 
 from temporal.effective import TimePoint, TimeRange
+from temporal.errors import MalformedHistoryError, MissingValueError
 from temporal.history import History, HistoryEntry
 from temporal.perspective import Perspective, Snapshot
 from temporal.sqla.history_entry_mixin import HistoryEntryMixin
@@ -14,64 +24,125 @@ class Base(DeclarativeBase):
 
 class Subscription(Base):
     __tablename__ = "subscription"
-    __allow_unmapped__ = True
 
     subscription_history_entries: Mapped[
         list["_SubscriptionHistoryEntry"]
     ] = relationship(
-        order_by="_SubscriptionHistoryEntry.version.asc()",
+        order_by=lambda: _SubscriptionHistoryEntry.version.asc(),
         cascade="all, delete-orphan",
+        lazy="selectin",
     )
 
     subscription_versions: Mapped[list["SubscriptionVersion"]] = relationship(
-        order_by="SubscriptionVersion.start_at.asc()",
+        order_by=lambda: SubscriptionVersion.start_at.asc(),
         cascade="all, delete-orphan",
+        lazy="selectin",
     )
 
-    # Internals
-    _history: History[str] | None = None
-    _latest_perspective: Perspective[str] | None = None
-
     @property
     def history(self) -> History[str]:
-        if not self._history:
-            self._history = History(
+        history = _histories.get(self)
+        if history is None:
+            history = _histories[self] = History(
                 id=str(self.id),
-                entries=[
-                    HistoryEntry(
-                        effectivity=TimeRange.from_datetimes(
-                            start=entry.start_at, end=entry.end_at
-                        ),
-                        settled_at=TimePoint(entry.settled_at),
-                        version=entry.version,
-                        _value=entry.value,
-                        _is_forgotten=entry.is_forgotten,
-                    )
-                    for entry in self.subscription_history_entries
-                ],
-                on_record=self._add_history_entry,
+                entries=map(_to_history_entry, self.subscription_history_entries),
+                on_record=_weak_on_record(self),
             )
 
-        return self._history
+        return history
 
     @property
     def latest_perspective(self) -> Perspective[str]:
-        if not self._latest_perspective:
-            self._latest_perspective = Perspective(
+        perspective = _latest_perspectives.get(self)
+        if perspective is None:
+            perspective = _latest_perspectives[self] = Perspective(
                 settled_at=TimePoint.now(),
-                entries=[
-                    Snapshot(
-                        effectivity=TimeRange.from_datetimes(
-                            start=version.start_at,
-                            end=version.end_at,
-                        ),
-                        value=version.value,
-                    )
-                    for version in self.subscription_versions
-                ],
+                entries=list(map(_to_snapshot, self.subscription_versions)),
+            )
+
+        return perspective
+
+    def value_at(self, at: TimePoint) -> str | None:
+        """
+        Return the latest known value at `at` point, or None if there is none.
+        """
+
+        try:
+            return self.latest_perspective.fetch(at=at)
+        except MissingValueError:
+            return None
+
+    def bulk_record(
+        self,
+        records: Iterable[tuple[str, TimeRange]],
+        _settled_at: TimePoint | None = None,
+    ) -> None:
+        """
+        Record each value as effective during its effectivity time range, in order.
+
+        Unlike going through `history.record`, history entries are inserted with a
+        single (executemany) INSERT and subscription_versions are rebuilt once.
+        The subscription must belong to a session.
+        """
+
+        session = object_session(self)
+        assert session is not None, "Subscription must belong to a session"
+        session.flush()
+
+        settled_at = _settled_at or TimePoint.now()
+        last_entry = (
+            self.subscription_history_entries[-1]
+            if self.subscription_history_entries
+            else None
+        )
+
+        # Check before inserting anything: the history couldn't be loaded afterwards
+        if last_entry and settled_at < TimePoint(last_entry.settled_at):
+            raise MalformedHistoryError(
+                "Entries's settled_at are expected be increasing"
             )
 
-        return self._latest_perspective
+        next_version = last_entry.version + 1 if last_entry else 0
+        entries = [
+            HistoryEntry(
+                effectivity=effectivity,
+                settled_at=settled_at,
+                version=version,
+                _value=value,
+            )
+            for version, (value, effectivity) in enumerate(records, next_version)
+        ]
+        if not entries:
+            return
+
+        session.execute(
+            insert(_SubscriptionHistoryEntry),
+            [
+                dict(
+                    subscription_id=self.id,
+                    start_at=entry.effectivity.start.to_datetime(),
+                    end_at=entry.effectivity.end.to_datetime(),
+                    settled_at=settled_at.to_datetime(),
+                    version=entry.version,
+                    is_forgotten=False,
+                    value=entry._value,
+                )
+                for entry in entries
+            ],
+        )
+
+        # Entries were inserted behind the ORM's back: reload them when needed
+        session.expire(self, ["subscription_history_entries"])
+
+        # An already loaded history, that callers may hold on to, is kept up to date
+        history = _histories.get(self)
+        if history is None:
+            history = self.history
+        else:
+            for entry in entries:
+                history._append(entry)
+
+        self._update_versions(history, settled_at)
 
     def _add_history_entry(self, entry: HistoryEntry[str], history: History[str]):
         # Keep history in sync, since it's happen only, we might get away with this
@@ -87,18 +158,105 @@ class Subscription(Base):
             )
         )
 
-        # Rebuild all subscription_versions
-        self.subscription_versions = [
-            SubscriptionVersion(
-                start_at=entry.effectivity.start.to_datetime(min_max_as_none=False),
-                end_at=entry.effectivity.end.to_datetime(min_max_as_none=False),
-                value=entry.value,
-            )
-            for entry in history.get_perspective(settled_at=entry.settled_at)
-        ]
+        # Being the latest, the entry overrides its whole effectivity: if the latest
+        # perspective already has its value over all of it, versions can't change.
+        try:
+            snapshot = self.latest_perspective.get_snapshot(at=entry.effectivity.start)
+        except MissingValueError:
+            pass
+        else:
+            if (
+                not entry.is_empty()
+                and snapshot.value == entry.get_value()
+                and entry.effectivity.included_in(snapshot.effectivity)
+            ):
+                return
+
+        self._update_versions(history, entry.settled_at)
+
+    def _update_versions(self, history: History[str], settled_at: TimePoint) -> None:
+        # Update subscription_versions in place, never rebinding the collection so
+        # that only the changed rows get deleted, updated or inserted.
+        perspective = history.get_perspective(settled_at=settled_at)
+        snapshots = list(perspective)
+
+        # Snapshots compare as values: when the projection is unchanged,
+        # like when recording an already known value, there is nothing to do.
+        if snapshots == list(map(_to_snapshot, self.subscription_versions)):
+            return
+
+        start_ats = {
+            snapshot.effectivity.start.to_datetime(min_max_as_none=False)
+            for snapshot in snapshots
+        }
+        for version in list(self.subscription_versions):
+            if version.start_at not in start_ats:
+                self.subscription_versions.remove(version)
+
+        # Remaining versions are ordered like the snapshots, the ones missing are
+        # inserted at their position to keep the collection ordered.
+        for index, snapshot in enumerate(snapshots):
+            start_at = snapshot.effectivity.start.to_datetime(min_max_as_none=False)
+            end_at = snapshot.effectivity.end.to_datetime(min_max_as_none=False)
+            if (
+                index < len(self.subscription_versions)
+                and self.subscription_versions[index].start_at == start_at
+            ):
+                version = self.subscription_versions[index]
+                version.end_at = end_at
+                version.value = snapshot.value
+            else:
+                self.subscription_versions.insert(
+                    index,
+                    SubscriptionVersion(
+                        start_at=start_at, end_at=end_at, value=snapshot.value
+                    ),
+                )
+
+        # The versions now match that perspective: keep it as the latest one rather
+        # than building it again from the versions on next access.
+        perspective.settled_at = TimePoint.now()
+        _latest_perspectives[self] = perspective
+
+
+# Internals: caches kept out of the mapped instances, and dropped along with them
+_histories: WeakKeyDictionary[Subscription, History[str]] = WeakKeyDictionary()
+_latest_perspectives: WeakKeyDictionary[
+    Subscription, Perspective[str]
+] = WeakKeyDictionary()
+
 
-        # Invalidate the latest_perspective cache
-        self._latest_perspective = None
+def _weak_on_record(
+    subscription: Subscription,
+) -> Callable[[HistoryEntry[str], History[str]], None]:
+    # The cached history must not keep its (weakly referenced) subscription alive
+    subscription_ref = ref(subscription)
+
+    def on_record(entry: HistoryEntry[str], history: History[str]) -> None:
+        subscription = subscription_ref()
+        if subscription is not None:
+            subscription._add_history_entry(entry, history)
+
+    return on_record
+
+
+def _to_history_entry(entry: "_SubscriptionHistoryEntry") -> HistoryEntry[str]:
+    return HistoryEntry(
+        effectivity=TimeRange.from_datetimes(start=entry.start_at, end=entry.end_at),
+        settled_at=TimePoint(entry.settled_at),
+        version=entry.version,
+        _value=entry.value,
+        _is_forgotten=entry.is_forgotten,
+    )
+
+
+def _to_snapshot(version: "SubscriptionVersion") -> Snapshot[str]:
+    return Snapshot(
+        effectivity=TimeRange.from_datetimes(
+            start=version.start_at, end=version.end_at
+        ),
+        value=version.value,
+    )
 
 
 class SubscriptionVersion(SnapshotMixin, Base):
@@ -110,6 +268,14 @@ class SubscriptionVersion(SnapshotMixin, Base):
     """
 
     __tablename__ = "subscription_version"
+    __table_args__ = (
+        # Matches the Subscription.subscription_versions loading order
+        Index(
+            "ix_subscription_version_subscription_id_start_at",
+            "subscription_id",
+            "start_at",
+        ),
+    )
 
     subscription_id: Mapped[int] = mapped_column(
         ForeignKey("subscription.id"),
@@ -123,6 +289,14 @@ class SubscriptionVersion(SnapshotMixin, Base):
 # This is a "private" model as the goal is to never interact it directly.
 class _SubscriptionHistoryEntry(HistoryEntryMixin, Base):
     __tablename__ = "subscription_history_entry"
+    __table_args__ = (
+        # Matches the Subscription.subscription_history_entries loading order
+        Index(
+            "ix_subscription_history_entry_subscription_id_version",
+            "subscription_id",
+            "version",
+        ),
+    )
 
     subscription_id: Mapped[int] = mapped_column(
         ForeignKey("subscription.id"),
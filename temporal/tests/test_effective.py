@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from temporal.effective import TimePoint, TimeRange
+from temporal.tests.conftest import at
+
+
+def test_subtract_all():
+    time_range = TimeRange(start=at(10), end=at(20))
+
+    # Nothing to subtract
+    assert time_range.subtract_all([]) == [time_range]
+
+    # Holes are kept in order, whatever the order of the subtracted ranges
+    assert time_range.subtract_all(
+        [TimeRange(start=at(17), end=at(18)), TimeRange(start=at(12), end=at(14))]
+    ) == [
+        TimeRange(start=at(10), end=at(12).prev()),
+        TimeRange(start=at(14).next(), end=at(17).prev()),
+        TimeRange(start=at(18).next(), end=at(20)),
+    ]
+
+    # Ranges covering the start or the end are clipped
+    assert time_range.subtract_all(
+        [TimeRange(end=at(11)), TimeRange(start=at(19))]
+    ) == [TimeRange(start=at(11).next(), end=at(19).prev())]
+
+    # Overlapping and adjacent ranges covering everything leave nothing
+    assert (
+        time_range.subtract_all(
+            [
+                TimeRange(start=at(5), end=at(15)),
+                TimeRange(start=at(12), end=at(16)),
+                TimeRange(start=at(16).next(), end=at(25)),
+            ]
+        )
+        == []
+    )
+
+
+def test_time_point_timezones():
+    utc_noon = datetime(2023, 1, 1, 12, tzinfo=timezone.utc)
+    paris_noon = datetime(2023, 1, 1, 12, tzinfo=timezone(timedelta(hours=1)))
+
+    # Aware datetimes are compared as UTC
+    assert TimePoint(utc_noon) == TimePoint(paris_noon.replace(hour=13))
+    assert TimePoint(paris_noon) < TimePoint(utc_noon)
+    assert TimePoint(paris_noon).to_datetime() == datetime(2023, 1, 1, 11)
+
+
+def test_time_point_out_of_range():
+    assert TimePoint.max().prev().next() == TimePoint.max()
+    assert TimePoint.min().add_days(1).add_days(-1) == TimePoint.min()
+
+    with pytest.raises(OverflowError):
+        TimePoint.max().next()
+    with pytest.raises(OverflowError):
+        TimePoint.min().prev()
+    with pytest.raises(OverflowError):
+        TimePoint.max().add_days(1)
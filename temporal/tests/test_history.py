@@ -0,0 +1,149 @@
+import pytest
+
+from temporal.effective import TimePoint, TimeRange
+from temporal.errors import MalformedHistoryError, MissingValueError
+from temporal.history import History
+from temporal.perspective import Snapshot
+from temporal.tests.conftest import at
+
+
+def snapshots(history: History[str], settled_at: TimePoint) -> list[Snapshot[str]]:
+    return list(history.get_perspective(settled_at=settled_at))
+
+
+def test_record_settled_before_the_last_entry():
+    history: History[str] = History(id="test")
+    history.record("a", effectivity=TimeRange(), _settled_at=at(5))
+    history.record("b", effectivity=TimeRange(), _settled_at=at(10))
+
+    with pytest.raises(MalformedHistoryError):
+        history.record("c", effectivity=TimeRange(), _settled_at=at(7))
+    with pytest.raises(MalformedHistoryError):
+        history.forget(effectivity=TimeRange(), _settled_at=at(7))
+
+    # Nothing was recorded
+    assert [entry.get_value() for entry in history] == ["a", "b"]
+    assert history.fetch(at(1), settled_at=at(8)) == "a"
+
+
+def test_overlapping_records():
+    history: History[str] = History(id="test")
+    history.record(
+        "a", effectivity=TimeRange(start=at(1), end=at(20)), _settled_at=at(1)
+    )
+    history.record(
+        "b", effectivity=TimeRange(start=at(5), end=at(10)), _settled_at=at(2)
+    )
+    history.record("c", effectivity=TimeRange(start=at(8)), _settled_at=at(3))
+
+    assert snapshots(history, settled_at=at(3)) == [
+        Snapshot(effectivity=TimeRange(start=at(1), end=at(5).prev()), value="a"),
+        Snapshot(effectivity=TimeRange(start=at(5), end=at(8).prev()), value="b"),
+        Snapshot(effectivity=TimeRange(start=at(8)), value="c"),
+    ]
+    assert history.fetch(at(1), settled_at=at(3)) == "a"
+    assert history.fetch(at(7), settled_at=at(3)) == "b"
+    assert history.fetch(at(25), settled_at=at(3)) == "c"
+    with pytest.raises(MissingValueError):
+        history.fetch(at(1).prev(), settled_at=at(3))
+
+
+def test_queries_at_an_older_settled_at():
+    history: History[str] = History(id="test")
+    history.record(
+        "a", effectivity=TimeRange(start=at(1), end=at(20)), _settled_at=at(1)
+    )
+    history.record(
+        "b", effectivity=TimeRange(start=at(5), end=at(10)), _settled_at=at(2)
+    )
+    history.record("c", effectivity=TimeRange(), _settled_at=at(3))
+
+    # Later entries are ignored
+    assert snapshots(history, settled_at=at(2)) == [
+        Snapshot(effectivity=TimeRange(start=at(1), end=at(5).prev()), value="a"),
+        Snapshot(effectivity=TimeRange(start=at(5), end=at(10)), value="b"),
+        Snapshot(effectivity=TimeRange(start=at(10).next(), end=at(20)), value="a"),
+    ]
+    assert history.fetch(at(7), settled_at=at(2)) == "b"
+    assert history.fetch(at(12), settled_at=at(1)) == "a"
+    with pytest.raises(MissingValueError):
+        history.fetch(at(25), settled_at=at(2))
+
+    # Segments split by older entries are merged back when one entry covers them
+    assert snapshots(history, settled_at=at(3)) == [
+        Snapshot(effectivity=TimeRange(), value="c")
+    ]
+
+
+def test_forget():
+    history: History[str] = History(id="test")
+    history.record(
+        "a", effectivity=TimeRange(start=at(1), end=at(20)), _settled_at=at(1)
+    )
+    history.forget(effectivity=TimeRange(start=at(5), end=at(10)), _settled_at=at(2))
+
+    assert snapshots(history, settled_at=at(2)) == [
+        Snapshot(effectivity=TimeRange(start=at(1), end=at(5).prev()), value="a"),
+        Snapshot(effectivity=TimeRange(start=at(10).next(), end=at(20)), value="a"),
+    ]
+    assert history.fetch(at(7), settled_at=at(1)) == "a"
+    with pytest.raises(MissingValueError):
+        history.fetch(at(7), settled_at=at(2))
+
+
+def test_record_after_a_query():
+    history: History[str] = History(id="test")
+    history.record(
+        "a", effectivity=TimeRange(start=at(1), end=at(20)), _settled_at=at(1)
+    )
+    history.record("b", effectivity=TimeRange(start=at(15)), _settled_at=at(2))
+    assert history.fetch(at(10), settled_at=at(2)) == "a"
+
+    # Recording within a known segment splits it on both sides
+    history.record(
+        "c", effectivity=TimeRange(start=at(5), end=at(10)), _settled_at=at(3)
+    )
+    # Recording over several segments only keeps what sticks out
+    history.record(
+        "d", effectivity=TimeRange(start=at(8), end=at(16)), _settled_at=at(4)
+    )
+
+    expected = [
+        Snapshot(effectivity=TimeRange(start=at(1), end=at(5).prev()), value="a"),
+        Snapshot(effectivity=TimeRange(start=at(5), end=at(8).prev()), value="c"),
+        Snapshot(effectivity=TimeRange(start=at(8), end=at(16)), value="d"),
+        Snapshot(effectivity=TimeRange(start=at(16).next()), value="b"),
+    ]
+    assert snapshots(history, settled_at=at(4)) == expected
+    assert history.fetch(at(12), settled_at=at(4)) == "d"
+    assert history.fetch(at(17), settled_at=at(4)) == "b"
+
+    # Same answers as a history projected from scratch
+    assert snapshots(History(id="test", entries=history), settled_at=at(4)) == expected
+
+
+def test_gaps():
+    history: History[str] = History(id="test")
+    history.record(
+        "a", effectivity=TimeRange(start=at(3), end=at(5)), _settled_at=at(1)
+    )
+    history.record(
+        "b", effectivity=TimeRange(start=at(10), end=at(12)), _settled_at=at(2)
+    )
+    with pytest.raises(MissingValueError):
+        history.fetch(at(7), settled_at=at(2))
+
+    # Recording from a point without any value
+    history.record(
+        "c", effectivity=TimeRange(start=at(1), end=at(4)), _settled_at=at(3)
+    )
+
+    assert snapshots(history, settled_at=at(3)) == [
+        Snapshot(effectivity=TimeRange(start=at(1), end=at(4)), value="c"),
+        Snapshot(effectivity=TimeRange(start=at(4).next(), end=at(5)), value="a"),
+        Snapshot(effectivity=TimeRange(start=at(10), end=at(12)), value="b"),
+    ]
+    assert snapshots(history, settled_at=at(2)) == [
+        Snapshot(effectivity=TimeRange(start=at(3), end=at(5)), value="a"),
+        Snapshot(effectivity=TimeRange(start=at(10), end=at(12)), value="b"),
+    ]
@@ -0,0 +1,74 @@
+import threading
+import time
+
+import pytest
+
+from temporal.lock import DefaultLock, _default_lock_instances
+
+
+def test_same_key_excludes():
+    lock = DefaultLock("key")
+    same_key_lock = DefaultLock("key")
+    other_key_lock = DefaultLock("other-key")
+
+    assert lock.acquire()
+    assert not same_key_lock.acquire(blocking=False)
+    assert other_key_lock.acquire(blocking=False)
+
+    lock.release()
+    assert same_key_lock.acquire(blocking=False)
+    same_key_lock.release()
+    other_key_lock.release()
+
+
+def test_registry_is_emptied():
+    lock = DefaultLock("key")
+    assert lock.acquire()
+    assert "key" in _default_lock_instances
+
+    # The shared lock is dropped once no instance holds it anymore
+    lock.release()
+    assert "key" not in _default_lock_instances
+
+
+def test_release_without_acquire():
+    lock = DefaultLock("key")
+    with pytest.raises(RuntimeError):
+        lock.release()
+
+    assert lock.acquire()
+    lock.release()
+    with pytest.raises(RuntimeError):
+        lock.release()
+
+
+def test_instance_shared_between_threads():
+    lock = DefaultLock("key")
+    acquired, done = threading.Event(), threading.Event()
+    errors = []
+
+    def hold_lock() -> None:
+        try:
+            lock.acquire()
+            acquired.set()
+            done.wait()
+            lock.release()
+        except Exception as error:
+            errors.append(error)
+            acquired.set()
+
+    assert lock.acquire()
+    thread = threading.Thread(target=hold_lock, daemon=True)
+    thread.start()
+    time.sleep(0.05)  # Let the other thread wait on the lock
+    lock.release()
+
+    # The other thread now holds the lock, the key is still locked
+    try:
+        assert acquired.wait(timeout=5)
+        assert not DefaultLock("key").acquire(blocking=False)
+    finally:
+        done.set()
+        thread.join(timeout=5)
+    assert errors == []
+    assert "key" not in _default_lock_instances
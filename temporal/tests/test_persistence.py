@@ -1,8 +1,10 @@
 import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import raiseload, selectinload
 from sqlalchemy.orm.session import Session
 
 from temporal.effective import TimePoint, TimeRange
-from temporal.errors import MissingValueError
+from temporal.errors import MalformedHistoryError, MissingValueError
 from temporal.tests.models import (Subscription, SubscriptionVersion,
                                    _SubscriptionHistoryEntry)
 
@@ -13,8 +15,14 @@ def test_session(session: Session):
     session.add(new_subscription)
     session.commit()
 
-    # We can query things
-    saved_subscription = session.query(Subscription).one()
+    # We can query things, loading the relationships upfront
+    saved_subscription = session.scalars(
+        select(Subscription).options(
+            selectinload(Subscription.subscription_history_entries),
+            selectinload(Subscription.subscription_versions),
+            raiseload("*"),
+        )
+    ).one()
 
     # We can traverse relationships
     assert saved_subscription == new_subscription
@@ -27,6 +35,7 @@ def test_session(session: Session):
     # No version leads to a MissingValueError
     with pytest.raises(MissingValueError):
         saved_subscription.history.fetch(at=now)
+    assert saved_subscription.value_at(now) is None
 
     # Recording a first version starting now
     saved_subscription.history.record("hey", effectivity=TimeRange(start=now))
@@ -48,17 +57,98 @@ def test_session(session: Session):
     assert len(saved_subscription.subscription_history_entries) == 4
     assert len(saved_subscription.subscription_versions) == 2
 
+    # Only columns are read, no need to load (and track) whole objects
     assert [
         f"{now} 0 hey None",
         f"{later} 1 ho None",
         f"{later} 2 hop None",
         f"{even_later} 3 hop None",
     ] == [
-        f"{entry.start_at} {entry.version} {entry.value} {entry.end_at}"
-        for entry in session.query(_SubscriptionHistoryEntry)
+        f"{start_at} {version} {value} {end_at}"
+        for start_at, version, value, end_at in session.execute(
+            select(
+                _SubscriptionHistoryEntry.start_at,
+                _SubscriptionHistoryEntry.version,
+                _SubscriptionHistoryEntry.value,
+                _SubscriptionHistoryEntry.end_at,
+            )
+        )
     ]
 
     assert [f"{now} hey", f"{later} hop"] == [
-        f"{entry.start_at} {entry.value}"
-        for entry in session.query(SubscriptionVersion)
+        f"{start_at} {value}"
+        for start_at, value in session.execute(
+            select(SubscriptionVersion.start_at, SubscriptionVersion.value)
+        )
+    ]
+
+
+def test_bulk_record(session: Session):
+    subscription = Subscription()
+    session.add(subscription)
+    subscription.history.record("hey", effectivity=TimeRange())
+
+    now = TimePoint.now()
+    later = now.add_days(days=2)
+
+    # Records are applied in order, the last one winning
+    subscription.bulk_record(
+        [
+            ("ho", TimeRange(start=now)),
+            ("hop", TimeRange(start=later)),
+            ("hip", TimeRange(start=later)),
+        ]
+    )
+    assert len(subscription.subscription_history_entries) == 4
+    assert subscription.subscription_history_entries[-1].version == 3
+    assert [version.value for version in subscription.subscription_versions] == [
+        "hey",
+        "ho",
+        "hip",
+    ]
+    assert subscription.history.fetch(at=later) == "hip"
+    assert subscription.latest_perspective.fetch(at=now) == "ho"
+    assert subscription.value_at(now.prev()) == "hey"
+
+    # Recording one by one still works after a bulk record
+    subscription.history.record("hup", effectivity=TimeRange(start=now))
+    assert len(subscription.subscription_history_entries) == 5
+    assert [version.value for version in subscription.subscription_versions] == [
+        "hey",
+        "hup",
+    ]
+
+    # Records settled before the last entry are rejected, before inserting anything
+    with pytest.raises(MalformedHistoryError):
+        subscription.bulk_record(
+            [("hap", TimeRange(start=later))], _settled_at=now.add_days(days=-1)
+        )
+    assert len(subscription.subscription_history_entries) == 5
+    assert subscription.history.fetch(at=later) == "hup"
+
+
+def test_bulk_record_with_a_loaded_history(session: Session):
+    subscription = Subscription()
+    session.add(subscription)
+    history = subscription.history
+    history.record("hey", effectivity=TimeRange())
+
+    now = TimePoint.now()
+    subscription.bulk_record([("ho", TimeRange(start=now))])
+
+    # The history in use sees the bulk records, and can record after them
+    assert history is subscription.history
+    assert history.fetch(at=now) == "ho"
+    history.record("hop", effectivity=TimeRange(start=now.add_days(days=2)))
+    session.flush()
+
+    assert [entry.version for entry in subscription.subscription_history_entries] == [
+        0,
+        1,
+        2,
+    ]
+    assert [version.value for version in subscription.subscription_versions] == [
+        "hey",
+        "ho",
+        "hop",
     ]